@@ -1,42 +1,107 @@
+import os
+import time
+import tempfile
+import zipfile
 import requests
+import orjson
 import numpy as np
-import pandas as pd
-from typing import List, Tuple, Dict, Any
-from datetime import datetime
-from technical_indicators import moving_avg, ema, macd, boll_bands, calculate_adx
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Any, Optional
+from functools import lru_cache
+from urllib.parse import quote
+from numba import njit, prange, types
+from .weekly_indicators import (_sma_last_nb, _macd_last_nb, _boll_last_nb, _adx_nb, _column,
+                                _F8_IN, _F8_OUT, HIGH, LOW, CLOSE, VOLUME)
 
-def fetch_historical(symbol: str, range_period: str = "1y") -> List[List[Any]]:
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "trading-model")
+# Seconds a cached series stays fresh. The latest bar keeps moving while the
+# market is open, so entries expire quickly instead of lasting the whole day.
+CACHE_TTL = 15 * 60
+
+# One pooled, kept-alive connection to Yahoo shared by every fetch (and thread)
+_SESSION = requests.Session()
+_SESSION.headers.update({'User-Agent': 'Mozilla/5.0', 'Accept-Encoding': 'gzip, deflate'})
+
+def fetch_historical(symbol: str, range_period: str = "1y", interval: str = "1d",
+                     adjusted: bool = False) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Fetch historical data from Yahoo Finance API.
-    Returns list of [date, open, high, low, close, volume]
+    Fetch historical data from Yahoo Finance API, cached for CACHE_TTL seconds
+    under CACHE_DIR (one file per symbol, range and interval, overwritten on refresh).
+    Returns (dates, ohlcv) where dates is a datetime64[D] (UTC) array and
+    ohlcv an (N, 5) float64 array of [open, high, low, close, volume] rows
+    aligned with it; format dates with dates.astype(str) when needed.
+    adjusted=True scales open/high/low/close by adjclose/close (dividends and
+    splits), matching yfinance's auto_adjust; volume is left as reported.
+    Both arrays are read-only (they may be shared with other callers); copy to modify.
     """
+    # quote() keeps symbols such as "../x" or "A/B" inside CACHE_DIR
+    path = os.path.join(CACHE_DIR, f"{quote(symbol, safe='')}_{range_period}_{interval}{'_adj' if adjusted else ''}.npz")
     try:
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?range={range_period}&interval=1d"
-        headers = {'User-Agent': 'Mozilla/5.0'}
+        mtime = os.stat(path).st_mtime
+        if time.time() - mtime < CACHE_TTL:
+            return _load_cached(path, mtime)
+    except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile):
+        pass  # Missing or corrupt cache file: refetch and overwrite it
+    
+    dates, ohlcv = _fetch_yahoo(symbol, range_period, interval, adjusted)
+    dates.setflags(write=False)
+    ohlcv.setflags(write=False)
+    _store_cached(path, dates, ohlcv)
+    return dates, ohlcv
+
+@lru_cache(maxsize=256)
+def _load_cached(path: str, mtime: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Load a cached (dates, ohlcv) pair as read-only arrays; memoized per file
+    version (mtime), so repeat runs skip the disk until the file is refreshed."""
+    with np.load(path) as cached:
+        dates, ohlcv = cached['dates'], cached['ohlcv']
+    dates.setflags(write=False)
+    ohlcv.setflags(write=False)
+    return dates, ohlcv
+
+def _store_cached(path: str, dates: np.ndarray, ohlcv: np.ndarray) -> None:
+    """Atomically write (dates, ohlcv) to `path`; caching is best-effort, so errors are ignored."""
+    tmp = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, dates=dates, ohlcv=ohlcv)
+        os.replace(tmp, path)
+        tmp = None
+    except (OSError, ValueError):
+        pass  # A read-only home just means refetching
+    finally:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+def _fetch_yahoo(symbol: str, range_period: str, interval: str,
+                 adjusted: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Download and parse the Yahoo chart endpoint into (dates, ohlcv)."""
+    try:
+        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?range={range_period}&interval={interval}"
         
-        response = requests.get(url, headers=headers, timeout=30)
+        response = _SESSION.get(url, timeout=30)
         
         if response.status_code != 200:
             raise Exception(f"API error: {response.status_code}")
         
-        content = response.text
+        content = response.content
         if not content:
             raise Exception("Empty response")
         
-        data = response.json()
+        data = orjson.loads(content)
         if not data.get('chart') or not data['chart'].get('result'):
             raise Exception("No chart.result")
         
         chart = data['chart']['result'][0]
         
-        # Handle nested array structure
-        if isinstance(chart, list):
-            for item in chart:
-                if isinstance(item, dict) and item.get('timestamp'):
-                    chart = item
-                    break
-            if isinstance(chart, list):
-                chart = chart[0]
+        # Handle nested array structure (well-formed payloads are already dicts)
+        if not isinstance(chart, dict):
+            chart = _unwrap(chart, ['timestamp'])
         
         if not chart.get('timestamp') or not isinstance(chart['timestamp'], list) or len(chart['timestamp']) == 0:
             raise Exception("No timestamp")
@@ -47,15 +112,8 @@ def fetch_historical(symbol: str, range_period: str = "1y") -> List[List[Any]]:
         quotes = chart['indicators']['quote'][0]
         
         # Handle nested array structure for quotes
-        if isinstance(quotes, list):
-            for item in quotes:
-                if (isinstance(item, dict) and 
-                    item.get('close') and item.get('open') and 
-                    item.get('high') and item.get('low') and item.get('volume')):
-                    quotes = item
-                    break
-            if isinstance(quotes, list):
-                quotes = quotes[0]
+        if not isinstance(quotes, dict):
+            quotes = _unwrap(quotes, ['close', 'open', 'high', 'low', 'volume'])
         
         if not isinstance(quotes, dict):
             raise Exception("quotes not object")
@@ -64,108 +122,184 @@ def fetch_historical(symbol: str, range_period: str = "1y") -> List[List[Any]]:
             raise Exception("Missing OHLCV")
         
         timestamps = chart['timestamp']
-        result = []
+        
+        # Bulk-convert the quote columns; missing values (None) become NaN
+        ohlcv = np.array(
+            [quotes['open'], quotes['high'], quotes['low'], quotes['close'], quotes['volume']],
+            dtype=np.float64
+        ).T
+        
+        if adjusted:
+            adjclose = chart['indicators'].get('adjclose')
+            if not adjclose or not isinstance(adjclose[0], dict) or 'adjclose' not in adjclose[0]:
+                raise Exception("No indicators.adjclose")
+            # Same as yfinance auto_adjust: scale OHLC by adjclose/close, keep volume
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = np.array(adjclose[0]['adjclose'], dtype=np.float64) / ohlcv[:, CLOSE]
+            ohlcv[:, :VOLUME] *= ratio[:, None]
         
         # WORKDAY LOGIC: Only include valid trading days with all OHLCV values > 0
-        for i in range(len(timestamps)):
-            date = datetime.utcfromtimestamp(timestamps[i])
-            formatted_date = date.strftime("%Y-%m-%d")
-            
-            open_price = quotes.get('open', [None])[i] if quotes.get('open') else 0
-            high_price = quotes.get('high', [None])[i] if quotes.get('high') else 0
-            low_price = quotes.get('low', [None])[i] if quotes.get('low') else 0
-            close_price = quotes.get('close', [None])[i] if quotes.get('close') else 0
-            volume = quotes.get('volume', [None])[i] if quotes.get('volume') else 0
-            
-            open_price = float(open_price) if open_price else 0
-            high_price = float(high_price) if high_price else 0
-            low_price = float(low_price) if low_price else 0
-            close_price = float(close_price) if close_price else 0
-            volume = float(volume) if volume else 0
-            
-            # WORKDAY CHECK: Skip if any OHLCV is 0 or invalid
-            if open_price > 0 and high_price > 0 and low_price > 0 and close_price > 0 and volume > 0:
-                result.append([
-                    formatted_date,
-                    open_price,
-                    high_price,
-                    low_price,
-                    close_price,
-                    volume
-                ])
-        
-        return result
+        # (NaN compares False, so bars with missing values drop out too)
+        valid = (ohlcv > 0).all(axis=1)
+        dates = np.asarray(timestamps, dtype='datetime64[s]')[valid].astype('datetime64[D]')
+        
+        return dates, np.ascontiguousarray(ohlcv[valid])
     
     except Exception as e:
         raise Exception(f"Failed to fetch historical data: {str(e)}")
 
-def run_strategy(symbol: str) -> List[List[Any]]:
+def _unwrap(node: Any, keys: List[str]) -> Any:
+    """Pick the first dict in a nested list that has all `keys` non-empty, else the first item."""
+    if not isinstance(node, list):
+        return node
+    for item in node:
+        if isinstance(item, dict) and all(item.get(k) for k in keys):
+            return item
+    return node[0]
+
+def fetch_historical_batch(symbols: List[str], range_period: str = "1y",
+                           max_workers: int = 8) -> Tuple[Dict[str, np.ndarray], Dict[str, str]]:
+    """
+    Fetch historical OHLCV arrays for many symbols on a thread pool sharing the
+    module's kept-alive connection pool (urllib3 keeps up to 10 connections).
+    The fetch is network-bound, so threads overlap the HTTP round-trips;
+    max_workers also caps concurrent requests to Yahoo to stay clear of 429s.
+    Returns ({symbol: ohlcv}, {symbol: error message}), each in input order;
+    feed an ohlcv to run_strategy(symbol, hist) to skip its own fetch.
+    """
+    def fetch(symbol):
+        try:
+            _, hist = fetch_historical(symbol, range_period)
+            return hist if len(hist) > 0 else "No data"
+        except Exception as e:
+            return str(e)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        fetched = list(executor.map(fetch, symbols))
+    
+    data, errors = {}, {}
+    for symbol, hist in zip(symbols, fetched):
+        if isinstance(hist, str):
+            errors[symbol] = hist
+        else:
+            data[symbol] = hist
+    return data, errors
+
+# Number of values in a run_strategy output row
+N_OUTPUTS = 17
+
+@njit(types.void(_F8_IN, _F8_IN, _F8_IN, _F8_OUT), cache=True, nogil=True)
+def _strategy_nb(close, high, low, out):
+    """Write the latest-bar strategy values for one symbol into out[:N_OUTPUTS].
+    Only the final SMA/Bollinger windows are read; MACD and ADX fold the
+    series to their latest values without building per-bar arrays.
+    Expects finite, non-empty input."""
+    n = len(close)
+    i = n - 1
+    
+    # Current and 10-bar-ago prices, moving averages over what history there is
+    price = close[i]
+    ten_day_price = close[max(i - 10, 0)]
+    dma50 = _sma_last_nb(close, min(50, n))
+    dma200 = _sma_last_nb(close, min(200, n))
+    
+    macd_line, macd_signal, macd_hist = _macd_last_nb(close, 12, 26, 9)
+    bb_upper, bb_middle, bb_lower = _boll_last_nb(close, 20, 2.0)
+    
+    adx = np.nan
+    plus_di = np.nan
+    minus_di = np.nan
+    if n >= 15:
+        adx, plus_di, minus_di = _adx_nb(high, low, close, 14)
+    
+    out[0] = price
+    out[1] = ten_day_price
+    out[2] = dma50
+    out[3] = dma200
+    out[4] = (price - ten_day_price) / ten_day_price * 100 if ten_day_price != 0 else 0.0
+    out[5] = (price - dma50) / dma50 * 100 if dma50 != 0 else 0.0
+    out[6] = (price - dma200) / dma200 * 100 if dma200 != 0 else 0.0
+    out[7] = (dma50 - dma200) / dma200 * 100 if dma200 != 0 else 0.0
+    out[8] = macd_line
+    out[9] = macd_signal
+    out[10] = macd_hist
+    out[11] = bb_upper
+    out[12] = bb_middle
+    out[13] = bb_lower
+    out[14] = adx
+    out[15] = plus_di
+    out[16] = minus_di
+
+@njit(types.void(types.float64[:, ::1], types.float64[:, ::1], types.float64[:, ::1],
+                 types.int64[::1], types.float64[:, ::1]),
+      cache=True, nogil=True, parallel=True)
+def _batch_strategy(closes, highs, lows, lengths, out):
+    """Run _strategy_nb for K symbols in parallel.
+    Inputs are (K, N) with each symbol's lengths[k] bars right-aligned; out is (K, N_OUTPUTS)."""
+    n = closes.shape[1]
+    for k in prange(closes.shape[0]):
+        start = n - lengths[k]
+        _strategy_nb(closes[k, start:], highs[k, start:], lows[k, start:], out[k])
+
+def _output_row(vals: np.ndarray) -> List[Any]:
+    """Round strategy values to 2 places, NaN -> None."""
+    return np.where(np.isnan(vals), None, np.round(vals, 2)).tolist()
+
+def run_strategy(symbol: str, hist: Optional[np.ndarray] = None) -> List[List[Any]]:
     """
     Main strategy runner - calculates daily indicators for a given symbol.
+    Pass a pre-fetched (N, 5) OHLCV array as `hist` to skip the network call.
     Returns list containing single row with calculated indicators.
     """
     try:
         range_period = "1y"
         
         # Fetch historical data
-        hist = fetch_historical(symbol, range_period)
-        if not hist or len(hist) == 0:
+        if hist is None:
+            _, hist = fetch_historical(symbol, range_period)
+        if len(hist) == 0:
             raise Exception("No data")
         
-        # Calculate moving averages
-        dma50 = moving_avg(hist, min(50, len(hist)), 4)
-        dma200 = moving_avg(hist, min(200, len(hist)), 4)
-        dma20 = moving_avg(hist, 20, 4)
-        
-        # Calculate MACD
-        macd_line, macd_signal, macd_hist = macd(hist, 4)
-        
-        # Calculate Bollinger Bands
-        bb_upper, bb_middle, bb_lower = boll_bands(hist, 4, 20, 2)
-        
-        # Calculate ADX
-        adx_results = calculate_adx(hist, 14)
-        
-        # Get current and historical indices
-        i = len(hist) - 1
-        i_10 = i - 10 if i - 10 >= 0 else 0
-        
-        # Extract values
-        price = hist[i][4]
-        ten_day_price = hist[i_10][4]
-        
-        # Calculate percentage changes
-        price_ten_day_change = ((price - ten_day_price) / ten_day_price) * 100 if ten_day_price != 0 else 0
-        price_50dma_change = ((price - dma50[i]) / dma50[i]) * 100 if pd.notna(dma50[i]) and dma50[i] != 0 else 0
-        price_200dma_change = ((price - dma200[i]) / dma200[i]) * 100 if pd.notna(dma200[i]) and dma200[i] != 0 else 0
-        dma50_200dma_change = ((dma50[i] - dma200[i]) / dma200[i]) * 100 if pd.notna(dma200[i]) and pd.notna(dma50[i]) and dma200[i] != 0 else 0
-        
-        # Build output row
-        output_row = [
-            round(price, 2) if not pd.isna(price) else None,
-            round(ten_day_price, 2) if not pd.isna(ten_day_price) else None,
-            round(dma50[i], 2) if pd.notna(dma50[i]) else None,
-            round(dma200[i], 2) if pd.notna(dma200[i]) else None,
-            round(price_ten_day_change, 2) if not pd.isna(price_ten_day_change) else None,
-            round(price_50dma_change, 2) if not pd.isna(price_50dma_change) else None,
-            round(price_200dma_change, 2) if not pd.isna(price_200dma_change) else None,
-            round(dma50_200dma_change, 2) if not pd.isna(dma50_200dma_change) else None,
-            round(macd_line[i], 2) if pd.notna(macd_line[i]) else None,
-            round(macd_signal[i], 2) if pd.notna(macd_signal[i]) else None,
-            round(macd_hist[i], 2) if pd.notna(macd_hist[i]) else None,
-            round(bb_upper[i], 2) if pd.notna(bb_upper[i]) else None,
-            round(bb_middle[i], 2) if pd.notna(bb_middle[i]) else None,
-            round(bb_lower[i], 2) if pd.notna(bb_lower[i]) else None,
-            round(adx_results['adx'], 2) if not pd.isna(adx_results['adx']) else None,
-            round(adx_results['plus_di'], 2) if not pd.isna(adx_results['plus_di']) else None,
-            round(adx_results['minus_di'], 2) if not pd.isna(adx_results['minus_di']) else None
-        ]
-        
-        return [output_row]
+        vals = np.empty(N_OUTPUTS)
+        _strategy_nb(_column(hist, CLOSE), _column(hist, HIGH), _column(hist, LOW), vals)
+        
+        return [_output_row(vals)]
     
     except Exception as e:
         return [[f"ERROR: {str(e)}"]]
 
+def run_strategies(symbols: List[str], max_workers: int = 8) -> Dict[str, List[List[Any]]]:
+    """
+    Run the daily strategy for many symbols.
+    Fetches run concurrently through fetch_historical_batch, then every
+    symbol's indicators are computed in one parallel Numba pass.
+    Returns {symbol: rows} in input order, rows as from run_strategy.
+    """
+    data, errors = fetch_historical_batch(symbols, "1y", max_workers)
+    ok = [symbol for symbol in symbols if symbol in data]
+    lengths = np.array([len(data[symbol]) for symbol in ok], dtype=np.int64)
+    n = int(lengths.max()) if len(ok) > 0 else 0
+    
+    # Right-align every symbol's bars in (K, N) arrays so the latest bar is column N-1
+    closes = np.zeros((len(ok), n))
+    highs = np.zeros((len(ok), n))
+    lows = np.zeros((len(ok), n))
+    for k, symbol in enumerate(ok):
+        hist = data[symbol]
+        closes[k, n - len(hist):] = hist[:, CLOSE]
+        highs[k, n - len(hist):] = hist[:, HIGH]
+        lows[k, n - len(hist):] = hist[:, LOW]
+    
+    # Compute stays in this process: _batch_strategy releases the GIL and
+    # spreads symbols over cores itself, so there is nothing to pickle to
+    # worker processes and no need for shared-memory input/output blocks.
+    out = np.empty((len(ok), N_OUTPUTS))
+    _batch_strategy(closes, highs, lows, lengths, out)
+    
+    rows = {symbol: [_output_row(out[k])] for k, symbol in enumerate(ok)}
+    return {symbol: rows[symbol] if symbol in rows else [[f"ERROR: {errors[symbol]}"]]
+            for symbol in symbols}
+
 # Example usage
 if __name__ == "__main__":
     symbol = "AAPL"  # Example ticker
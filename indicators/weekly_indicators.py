@@ -1,147 +1,286 @@
 import numpy as np
 import pandas as pd
-from typing import List, Tuple, Dict, Any
+from numba import njit, types
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Tuple, Dict
 
-def moving_avg(data: List[List[float]], lookback: int, col_idx: int) -> List[float]:
-    """Identical to your JS movingAvg()"""
-    if not data or len(data) == 0:
-        return []
+# Numba kernels below declare explicit signatures, so they compile eagerly at
+# import; cache=True stores the machine code under __pycache__ and later
+# processes load it instead of recompiling.
+# Import this module only as indicators.weekly_indicators (package-relative
+# from sibling modules): the Numba cache is keyed by file but records the
+# module name, so loading the same file under a second name (e.g. top-level
+# `weekly_indicators` via sys.path) fails when the cached kernels unpickle.
+
+# Kernel input type: read-only, any-layout float64 vector. Accepts strided
+# column views of the (N, 5) OHLCV block and read-only cached arrays as-is.
+_F8_IN = types.Array(types.float64, 1, 'A', readonly=True)
+_F8_OUT = types.float64[::1]
+
+# Column layout of the OHLCV arrays produced by the fetchers
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+
+def _column(data: np.ndarray, col_idx: int) -> np.ndarray:
+    """View one column of an (N, 5) float64 OHLCV array (no copy)."""
+    return np.asarray(data[:, col_idx], dtype=np.float64)
+
+def moving_avg(data: np.ndarray, lookback: int, col_idx: int = CLOSE) -> np.ndarray:
+    """Identical to your JS movingAvg() - O(N) rolling sum over a cumsum"""
+    if len(data) == 0:
+        return np.empty(0)
     
-    result = []
-    for i in range(len(data)):
-        if i < lookback - 1:
-            result.append(np.nan)
-        else:
-            window = [float(data[j][col_idx]) for j in range(i - lookback + 1, i + 1) 
-                     if j < len(data) and pd.notna(float(data[j][col_idx]))]
-            result.append(np.mean(window) if window else np.nan)
+    c = _column(data, col_idx)
+    result = np.full(len(c), np.nan)
+    if lookback > len(c):
+        return result
+    
+    cs = np.concatenate(([0.0], np.cumsum(c)))
+    result[lookback - 1:] = (cs[lookback:] - cs[:-lookback]) / lookback
     return result
 
-def ema(data: List[List[float]], lookback: int, col_idx: int) -> List[float]:
+@njit(_F8_OUT(_F8_IN, types.int64), cache=True, fastmath=True, error_model='numpy', nogil=True)
+def _ema_nb(x, lookback):
+    """EMA kernel: seed with the mean of the first `lookback` samples, then recur.
+    Expects finite input (callers strip leading NaNs). The recurrence is
+    written e += k*(x - e): one sub and one fused multiply-add per step."""
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < lookback:
+        return out
+    
+    k = 2.0 / (lookback + 1)
+    e = 0.0
+    for i in range(lookback):
+        e += x[i]
+    e /= lookback
+    out[lookback - 1] = e
+    for i in range(lookback, n):
+        e += k * (x[i] - e)
+        out[i] = e
+    return out
+
+def _ema_valid(x: np.ndarray, lookback: int) -> np.ndarray:
+    """Run _ema_nb over `x` from its first non-NaN sample onwards."""
+    result = np.full(len(x), np.nan)
+    valid = np.flatnonzero(~np.isnan(x))
+    if len(valid) > 0:
+        start = valid[0]
+        result[start:] = _ema_nb(x[start:], lookback)
+    return result
+
+def ema(data: np.ndarray, lookback: int, col_idx: int = CLOSE) -> np.ndarray:
     """Identical to your JS ema() with smoothing constant k=2/(N+1)"""
-    if not data or len(data) == 0:
-        return []
+    if len(data) == 0:
+        return np.empty(0)
     
-    result = []
-    k = 2 / (lookback + 1)
-    prev_ema = None
+    return _ema_valid(_column(data, col_idx), lookback)
+
+@njit(types.UniTuple(_F8_OUT, 3)(_F8_IN, types.int64, types.int64, types.int64),
+      cache=True, fastmath=True, error_model='numpy', nogil=True)
+def _macd_nb(close, fast, slow, signal):
+    """Fused MACD kernel: fast/slow EMAs, signal EMA and histogram in one pass.
+    Expects finite input and fast < slow."""
+    n = len(close)
+    macd_line = np.full(n, np.nan)
+    signal_line = np.full(n, np.nan)
+    histogram = np.full(n, np.nan)
     
-    for i in range(len(data)):
-        if i < lookback - 1:
-            result.append(np.nan)
-        elif i == lookback - 1:
-            window = [float(data[j][col_idx]) for j in range(i + 1) 
-                     if pd.notna(float(data[j][col_idx]))]
-            prev_ema = np.mean(window) if window else np.nan
-            result.append(prev_ema)
+    kf = 2.0 / (fast + 1)
+    ks = 2.0 / (slow + 1)
+    kg = 2.0 / (signal + 1)
+    ef = 0.0
+    es = 0.0
+    eg = 0.0
+    for i in range(n):
+        x = close[i]
+        if i < fast:
+            ef += x
+            if i == fast - 1:
+                ef /= fast
         else:
-            current = float(data[i][col_idx])
-            if pd.notna(current) and pd.notna(prev_ema):
-                prev_ema = current * k + prev_ema * (1 - k)
-                result.append(prev_ema)
-            else:
-                result.append(np.nan)
-    return result
+            ef += kf * (x - ef)
+        if i < slow:
+            es += x
+            if i < slow - 1:
+                continue
+            es /= slow
+        else:
+            es += ks * (x - es)
+        
+        m = ef - es
+        macd_line[i] = m
+        
+        # Signal seeds on the first `signal` MACD values, then recurs
+        j = i - (slow - 1)
+        if j < signal:
+            eg += m
+            if j < signal - 1:
+                continue
+            eg /= signal
+        else:
+            eg += kg * (m - eg)
+        signal_line[i] = eg
+        histogram[i] = m - eg
+    return macd_line, signal_line, histogram
 
-def macd(data: List[List[float]], col_idx: int) -> Tuple[List[float], List[float], List[float]]:
+@njit(types.UniTuple(types.float64, 3)(_F8_IN, types.int64, types.int64, types.int64),
+      cache=True, fastmath=True, error_model='numpy', nogil=True)
+def _macd_last_nb(close, fast, slow, signal):
+    """Latest (macd, signal, histogram) of _macd_nb without building the series.
+    NaN until slow + signal - 1 samples are available."""
+    kf = 2.0 / (fast + 1)
+    ks = 2.0 / (slow + 1)
+    kg = 2.0 / (signal + 1)
+    ef = 0.0
+    es = 0.0
+    eg = 0.0
+    m = np.nan
+    g = np.nan
+    for i in range(len(close)):
+        x = close[i]
+        if i < fast:
+            ef += x
+            if i == fast - 1:
+                ef /= fast
+        else:
+            ef += kf * (x - ef)
+        if i < slow:
+            es += x
+            if i < slow - 1:
+                continue
+            es /= slow
+        else:
+            es += ks * (x - es)
+
+        m = ef - es
+        j = i - (slow - 1)
+        if j < signal:
+            eg += m
+            if j < signal - 1:
+                continue
+            eg /= signal
+        else:
+            eg += kg * (m - eg)
+        g = eg
+
+    if np.isnan(g):
+        return np.nan, np.nan, np.nan
+    return m, g, m - g
+
+def macd(data: np.ndarray, col_idx: int = CLOSE) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Identical to your JS macd() - EMA12-EMA26, Signal=EMA9(MACD), Histogram"""
-    ema12 = ema(data, 12, col_idx)
-    ema26 = ema(data, 26, col_idx)
+    c = _column(data, col_idx)
+    macd_line = np.full(len(c), np.nan)
+    signal_line = np.full(len(c), np.nan)
+    histogram = np.full(len(c), np.nan)
     
-    macd_line = []
-    for i in range(len(data)):
-        if pd.notna(ema12[i]) and pd.notna(ema26[i]):
-            macd_line.append(ema12[i] - ema26[i])
-        else:
-            macd_line.append(np.nan)
+    valid = np.flatnonzero(~np.isnan(c))
+    if len(valid) > 0:
+        start = valid[0]
+        macd_line[start:], signal_line[start:], histogram[start:] = _macd_nb(c[start:], 12, 26, 9)
     
-    # Signal line = EMA9 of MACD line
-    signal_data = [[val] for val in macd_line]
-    signal_line = ema(signal_data, 9, 0)
+    return macd_line, signal_line, histogram
+
+def boll_bands(data: np.ndarray, col_idx: int = CLOSE, period: int = 20, std_dev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Identical to your JS bollBands() - SMA20 ± 2*STD20 over a sliding window view"""
+    c = _column(data, col_idx)
+    upper = np.full(len(c), np.nan)
+    middle = np.full(len(c), np.nan)
+    lower = np.full(len(c), np.nan)
+    if period > len(c):
+        return upper, middle, lower
     
-    histogram = []
-    for i in range(len(data)):
-        if pd.notna(macd_line[i]) and pd.notna(signal_line[i]):
-            histogram.append(macd_line[i] - signal_line[i])
-        else:
-            histogram.append(np.nan)
+    windows = sliding_window_view(c, period)
+    sma = windows.mean(axis=1)
+    std = windows.std(axis=1)
     
-    return macd_line, signal_line, histogram
+    upper[period - 1:] = sma + std * std_dev
+    middle[period - 1:] = sma
+    lower[period - 1:] = sma - std * std_dev
+    return upper, middle, lower
+
+@njit(types.float64(_F8_IN, types.int64), cache=True, nogil=True)
+def _sma_last_nb(x, lookback):
+    """Mean of the last `lookback` samples: the latest moving_avg value (NaN if n < lookback)."""
+    n = len(x)
+    if lookback > n or lookback < 1:
+        return np.nan
+    s = 0.0
+    for i in range(n - lookback, n):
+        s += x[i]
+    return s / lookback
 
-def boll_bands(data: List[List[float]], col_idx: int, period: int = 20, std_dev: float = 2.0) -> Tuple[List[float], List[float], List[float]]:
-    """Identical to your JS bollBands() - SMA20 ± 2*STD20"""
-    upper, middle, lower = [], [], []
+@njit(types.UniTuple(types.float64, 3)(_F8_IN, types.int64, types.float64), cache=True, nogil=True)
+def _boll_last_nb(x, period, std_dev):
+    """Latest (upper, middle, lower) of boll_bands from the final window only;
+    population std as in np.std. NaN if n < period."""
+    middle = _sma_last_nb(x, period)
+    if np.isnan(middle):
+        return np.nan, np.nan, np.nan
+    ss = 0.0
+    for i in range(len(x) - period, len(x)):
+        d = x[i] - middle
+        ss += d * d
+    std = np.sqrt(ss / period)
+    return middle + std * std_dev, middle, middle - std * std_dev
+
+@njit(types.UniTuple(types.float64, 3)(_F8_IN, _F8_IN, _F8_IN, types.int64), cache=True, nogil=True)
+def _adx_nb(high, low, close, period):
+    """Wilder ADX kernel returning the latest (adx, plus_di, minus_di).
+    TR/DM sums use the s - s/p + x recurrence; ADX averages the first
+    `period` DX values, then smooths (adx*(p-1) + dx)/p."""
+    s_tr = 0.0
+    s_pdm = 0.0
+    s_mdm = 0.0
+    dx_sum = 0.0
+    adx = np.nan
+    plus_di = np.nan
+    minus_di = np.nan
     
-    for i in range(len(data)):
-        if i < period - 1:
-            upper.append(np.nan); middle.append(np.nan); lower.append(np.nan)
-        else:
-            window = [float(data[j][col_idx]) for j in range(i - period + 1, i + 1)]
-            window = [x for x in window if pd.notna(x)]
-            
-            if len(window) == 0:
-                upper.append(np.nan); middle.append(np.nan); lower.append(np.nan)
+    for i in range(1, len(close)):
+        high_diff = high[i] - high[i - 1]
+        low_diff = low[i - 1] - low[i]
+        pdm = high_diff if high_diff > low_diff and high_diff > 0 else 0.0
+        mdm = low_diff if low_diff > high_diff and low_diff > 0 else 0.0
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        
+        # j indexes the TR/DM series, which starts at the second bar
+        j = i - 1
+        if j < period:
+            s_tr += tr
+            s_pdm += pdm
+            s_mdm += mdm
+            if j < period - 1:
                 continue
-                
-            sma = np.mean(window)
-            std = np.std(window)
-            upper.append(sma + std * std_dev)
-            middle.append(sma)
-            lower.append(sma - std * std_dev)
+        else:
+            s_tr = s_tr - s_tr / period + tr
+            s_pdm = s_pdm - s_pdm / period + pdm
+            s_mdm = s_mdm - s_mdm / period + mdm
+        
+        plus_di = s_pdm / s_tr * 100 if s_tr != 0 else 0.0
+        minus_di = s_mdm / s_tr * 100 if s_tr != 0 else 0.0
+        sum_di = plus_di + minus_di
+        dx = abs(plus_di - minus_di) / sum_di * 100 if sum_di != 0 else 0.0
+        
+        k = j - (period - 1)
+        if k < period:
+            dx_sum += dx
+            if k == period - 1:
+                adx = dx_sum / period
+        else:
+            adx = (adx * (period - 1) + dx) / period
     
-    return upper, middle, lower
+    return adx, plus_di, minus_di
 
-def calculate_adx(data: List[List[float]], period: int = 14) -> Dict[str, float]:
+def calculate_adx(data: np.ndarray, period: int = 14) -> Dict[str, float]:
     """Identical to your JS calculateADX() - Wilder's smoothing, +DI/-DI, DX, ADX"""
     if len(data) < period + 1:
         return {'adx': np.nan, 'plus_di': np.nan, 'minus_di': np.nan}
     
-    highs = [row[2] for row in data]
-    lows = [row[3] for row in data]
-    closes = [row[4] for row in data]
-    
-    true_ranges, plus_dm, minus_dm = [], [], []
-    for i in range(1, len(highs)):
-        high_diff = highs[i] - highs[i-1]
-        low_diff = lows[i-1] - lows[i]
-        
-        plus_dm.append(max(high_diff, 0) if high_diff > low_diff else 0)
-        minus_dm.append(max(low_diff, 0) if low_diff > high_diff else 0)
-        true_ranges.append(max(
-            highs[i] - lows[i],
-            abs(highs[i] - closes[i-1]),
-            abs(lows[i] - closes[i-1])
-        ))
-    
-    # Wilder's smoothing (identical to JS)
-    def wilders_smooth(series: List[float], p: int) -> List[float]:
-        smoothed = [np.nan] * len(series)
-        if len(series) < p:
-            return smoothed
-        smoothed[p-1] = np.mean(series[:p])
-        for i in range(p, len(series)):
-            smoothed[i] = (smoothed[i-1] * (p - 1) + series[i]) / p
-        return smoothed
-    
-    smooth_tr = wilders_smooth(true_ranges, period)
-    smooth_pdm = wilders_smooth(plus_dm, period)
-    smooth_mdm = wilders_smooth(minus_dm, period)
-    
-    plus_di, minus_di, dx = [], [], []
-    for i in range(len(smooth_tr)):
-        if pd.notna(smooth_tr[i]) and smooth_tr[i] != 0:
-            plus_di.append((smooth_pdm[i] / smooth_tr[i]) * 100)
-            minus_di.append((smooth_mdm[i] / smooth_tr[i]) * 100)
-            sum_di = plus_di[-1] + minus_di[-1]
-            dx.append(abs(plus_di[-1] - minus_di[-1]) / sum_di * 100 if sum_di != 0 else 0)
-        else:
-            plus_di.append(np.nan); minus_di.append(np.nan); dx.append(np.nan)
-    
-    adx_smooth = wilders_smooth(dx, period)
-    last_idx = len(adx_smooth) - 1
+    adx, plus_di, minus_di = _adx_nb(_column(data, HIGH), _column(data, LOW), _column(data, CLOSE), period)
     
     return {
-        'adx': round(adx_smooth[last_idx], 2) if pd.notna(adx_smooth[last_idx]) else np.nan,
-        'plus_di': round(plus_di[last_idx + period - 1], 2) if len(plus_di) > last_idx + period - 1 else np.nan,
-        'minus_di': round(minus_di[last_idx + period - 1], 2) if len(minus_di) > last_idx + period - 1 else np.nan
+        'adx': round(adx, 2) if pd.notna(adx) else np.nan,
+        'plus_di': round(plus_di, 2) if pd.notna(plus_di) else np.nan,
+        'minus_di': round(minus_di, 2) if pd.notna(minus_di) else np.nan
     }
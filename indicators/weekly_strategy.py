@@ -1,49 +1,34 @@
-import yfinance as yf
 import pandas as pd
 from typing import List
 from .weekly_indicators import *
+from .daily_indicators import fetch_historical
 
 def run_strategy_w(symbol: str) -> List[List[float]]:
     """Exact replica of your JS RUN_STRATEGY_W(symbol) - Weekly timeframe"""
     try:
-        # Fetch 1y weekly data (identical to JS range="1y", interval=1wk)
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period="1y", interval="1wk")
+        # Fetch 1y weekly data (identical to JS range="1y", interval=1wk),
+        # dividend/split adjusted as yfinance's history() returned it;
+        # fetch_historical already drops weeks with any OHLCV <= 0
+        _, data = fetch_historical(symbol, "1y", interval="1wk", adjusted=True)
         
-        if hist.empty:
-            return [["ERROR: No data"]]
-        
-        # Convert to your JS format [[date, open, high, low, close, volume]]
-        data = []
-        for idx, row in hist.iterrows():
-            if all(row[['Open', 'High', 'Low', 'Close', 'Volume']] > 0):
-                data.append([
-                    idx.strftime('%Y-%m-%d'),
-                    float(row['Open']),
-                    float(row['High']),
-                    float(row['Low']),
-                    float(row['Close']),
-                    int(row['Volume'])
-                ])
-        
-        if not data:
+        if len(data) == 0:
             return [["ERROR: No valid trading days"]]
         
         # Calculate all indicators (identical logic/order)
-        dma50 = moving_avg(data, min(50, len(data)), 4)
-        dma200 = moving_avg(data, min(200, len(data)), 4)
-        dma20 = moving_avg(data, 20, 4)
+        dma50 = moving_avg(data, min(50, len(data)), CLOSE)
+        dma200 = moving_avg(data, min(200, len(data)), CLOSE)
+        dma20 = moving_avg(data, 20, CLOSE)
         
-        macd_line, macd_signal, macd_hist = macd(data, 4)
-        bb_upper, bb_middle, bb_lower = boll_bands(data, 4, 20, 2.0)
+        macd_line, macd_signal, macd_hist = macd(data, CLOSE)
+        bb_upper, bb_middle, bb_lower = boll_bands(data, CLOSE, 20, 2.0)
         adx_results = calculate_adx(data, 14)
         
         # Current values (i = len(data)-1)
         i = len(data) - 1
         i_10 = max(i - 10, 0)
         
-        price = data[i][4]
-        ten_day_price = data[i_10][4]
+        price = data[i, CLOSE]
+        ten_day_price = data[i_10, CLOSE]
         
         output_row = [
             price,